@@ -1,8 +1,16 @@
 import streamlit as st
+import pandas as pd
 import sqlite3
 import json
 import os
-from datetime import datetime, timedelta
+
+# Numba is optional: when available, the conflict-window scan runs as a
+# compiled kernel; otherwise the pure-Python bitmask loop is used.
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    njit = None
 
 # ---------------------------
 # Database Setup and Helpers
@@ -10,84 +18,251 @@ from datetime import datetime, timedelta
 
 DB_FILE = "schedules.db"
 
+@st.cache_resource
+def get_conn():
+    """
+    Return the shared SQLite connection for this app instance.
+
+    Streamlit reruns the script on every interaction; opening and closing
+    a connection per helper call thrashes SQLite's page cache. A single
+    cached connection (check_same_thread=False so reruns on other threads
+    can reuse it) stays hot across reruns.
+    """
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False, cached_statements=64)
+    # WAL + NORMAL sync cuts fsyncs on writes and lets concurrent sessions
+    # read while one writes; temp tables and the mmap'd page cache stay in
+    # memory for a read-heavy workload.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=134217728")
+    return conn
+
+# One INTEGER column per weekday, each holding the day's 64-bit busy
+# bitmask. 56 bytes per row instead of kilobytes of JSON, and no parsing
+# on read.
+DAY_COLUMNS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
 def init_db():
     """Initialize the database and create tables if they do not exist."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_conn()
     cursor = conn.cursor()
-    cursor.execute("""
+    day_cols = ", ".join(f"{col} INTEGER NOT NULL DEFAULT 0" for col in DAY_COLUMNS)
+    # WITHOUT ROWID clusters the small rows on the username key itself,
+    # saving a rowid indirection on every point lookup.
+    cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS users (
             username TEXT PRIMARY KEY,
             semester TEXT,
-            schedule TEXT
-        )
+            {day_cols}
+        ) WITHOUT ROWID
     """)
+    # Lets list_users_by_semester stream its ORDER BY semester, username
+    # result straight off the index instead of sorting.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_semester ON users(semester, username)")
     conn.commit()
-    conn.close()
+    _migrate_legacy_schema(conn)
+
+def _migrate_legacy_schema(conn):
+    """
+    One-time migration from the old JSON schema.
+
+    Older databases stored the schedule as a JSON TEXT column of
+    day -> list of 'HH:MM' strings. Rewrite such tables in place to the
+    per-day bitmask columns.
+    """
+    cursor = conn.cursor()
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(users)")}
+    if "schedule" not in columns:
+        return
+    rows = cursor.execute("SELECT username, semester, schedule FROM users").fetchall()
+    cursor.execute("DROP TABLE users")
+    conn.commit()
+    init_db()
+    for username, semester, schedule_json in rows:
+        schedule = json.loads(schedule_json) if schedule_json else {}
+        masks = _encode_schedule(schedule)
+        cursor.execute(
+            f"INSERT INTO users (username, semester, {', '.join(DAY_COLUMNS)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(DAY_COLUMNS))})",
+            [username, semester] + masks)
+    conn.commit()
+
+# Weekdays and time slots are constant for the life of the app, so they are
+# computed once at import time instead of being rebuilt (with strptime /
+# strftime in the time-slot case) on every call inside the gap finders.
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# 15‑minute slots starting at 06:00 and ending at 21:45 (each slot
+# represents a 15‑minute block).
+TIME_SLOTS = tuple(f"{h:02d}:{m:02d}" for h in range(6, 22) for m in (0, 15, 30, 45))
 
 def get_weekdays():
-    """Return a list of weekday names."""
-    return ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    """Return the weekday names (kept as an alias for WEEKDAYS)."""
+    return WEEKDAYS
 
 def get_time_slots():
+    """Return the time slot strings (kept as an alias for TIME_SLOTS)."""
+    return TIME_SLOTS
+
+# The 64 slots of a day fit exactly in one 64-bit integer, so each
+# (user, day) busy set is packed into a single bitmask: bit i is set when
+# the user is busy during slot i. Comparing users then reduces to bitwise
+# ORs/ANDs on whole days instead of per-slot membership tests.
+SLOT_INDEX = {ts: i for i, ts in enumerate(TIME_SLOTS)}
+_N_SLOTS = len(TIME_SLOTS)
+_FULL_MASK = (1 << _N_SLOTS) - 1
+
+def _busy_list_to_mask(busy_times):
+    """Pack an iterable of 'HH:MM' busy slots into a day bitmask."""
+    mask = 0
+    for ts in busy_times:
+        mask |= 1 << SLOT_INDEX[ts]
+    return mask
+
+def _mask_to_busy_list(mask):
+    """Unpack a day bitmask back into a sorted list of 'HH:MM' busy slots."""
+    return [ts for i, ts in enumerate(TIME_SLOTS) if mask >> i & 1]
+
+def _mask_to_db(mask):
+    """Reinterpret a uint64 mask as SQLite's signed 64-bit INTEGER."""
+    return mask - (1 << 64) if mask >= (1 << 63) else mask
+
+_SELECT_COLUMNS = "username, semester, " + ", ".join(DAY_COLUMNS)
+
+def _decode_row(row):
     """
-    Return a list of time slot strings in 15‑minute increments,
-    starting at 06:00 and ending at 21:45 (each slot represents a 15‑minute block).
+    Decode a (username, semester, *day masks) row into (username, record),
+    where record has the {"semester", "masks"} shape the gap finders use.
+    Masking with _FULL_MASK undoes the signed storage.
+
+    Every read path goes through this, so a representation change (like the
+    JSON -> bitmask migration) only has to happen here.
     """
-    slots = []
-    current = datetime.strptime("06:00", "%H:%M")
-    end = datetime.strptime("22:00", "%H:%M")
-    while current < end:
-        slots.append(current.strftime("%H:%M"))
-        current += timedelta(minutes=15)
-    return slots
+    masks = tuple(mask & _FULL_MASK for mask in row[2:])
+    return row[0], {"semester": row[1], "masks": masks}
+
+def _encode_schedule(schedule):
+    """Encode a day -> busy-list dict into the signed per-day mask columns."""
+    return [_mask_to_db(_busy_list_to_mask(schedule.get(day, ()))) for day in WEEKDAYS]
 
 def get_user(username):
     """Return the user record as a dict (or None if not found)."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_conn()
     cursor = conn.cursor()
-    cursor.execute("SELECT username, semester, schedule FROM users WHERE username = ?", (username,))
+    cursor.execute(f"SELECT {_SELECT_COLUMNS} FROM users WHERE username = ?", (username,))
     row = cursor.fetchone()
-    conn.close()
     if row:
-        username, semester, schedule_json = row
-        schedule = json.loads(schedule_json) if schedule_json else {day: [] for day in get_weekdays()}
-        return {"username": username, "semester": semester, "schedule": schedule}
+        username, record = _decode_row(row)
+        schedule = {day: _mask_to_busy_list(record["masks"][d])
+                    for d, day in enumerate(WEEKDAYS)}
+        return {"username": username, "semester": record["semester"], "schedule": schedule}
     return None
 
 def create_user(username, semester):
     """Create a new user with an empty schedule."""
-    schedule = { day: [] for day in get_weekdays() }
-    schedule_json = json.dumps(schedule)
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_conn()
     cursor = conn.cursor()
-    cursor.execute("INSERT INTO users (username, semester, schedule) VALUES (?, ?, ?)",
-                   (username, semester, schedule_json))
+    cursor.execute("INSERT INTO users (username, semester) VALUES (?, ?)",
+                   (username, semester))
     conn.commit()
-    conn.close()
+    bump_data_version()
 
 def update_schedule(username, schedule):
-    """Update the schedule for the given username."""
-    schedule_json = json.dumps(schedule)
-    conn = sqlite3.connect(DB_FILE)
+    """Update the schedule (a dict of day -> busy time list) for the given username."""
+    masks = _encode_schedule(schedule)
+    conn = get_conn()
     cursor = conn.cursor()
-    cursor.execute("UPDATE users SET schedule = ? WHERE username = ?", (schedule_json, username))
+    cursor.execute(
+        f"UPDATE users SET {', '.join(f'{col} = ?' for col in DAY_COLUMNS)} WHERE username = ?",
+        masks + [username])
     conn.commit()
-    conn.close()
+    bump_data_version()
 
 def load_all_users():
     """Load all user records from the database as a dict."""
     data = {}
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_conn()
     cursor = conn.cursor()
-    cursor.execute("SELECT username, semester, schedule FROM users")
+    cursor.execute(f"SELECT {_SELECT_COLUMNS} FROM users")
     rows = cursor.fetchall()
-    conn.close()
     for row in rows:
-        username, semester, schedule_json = row
-        schedule = json.loads(schedule_json) if schedule_json else {day: [] for day in get_weekdays()}
-        data[username] = {"semester": semester, "schedule": schedule}
+        username, record = _decode_row(row)
+        data[username] = record
+    return data
+
+def load_users(usernames):
+    """
+    Load only the given users' records, in the same shape as load_all_users.
+
+    Filtering in SQL keeps the gap finders linear in the number of selected
+    users instead of paying for every row in the table.
+    """
+    data = {}
+    if not usernames:
+        return data
+    conn = get_conn()
+    cursor = conn.cursor()
+    placeholders = ", ".join("?" * len(usernames))
+    cursor.execute(f"SELECT {_SELECT_COLUMNS} FROM users WHERE username IN ({placeholders})",
+                   list(usernames))
+    for row in cursor.fetchall():
+        username, record = _decode_row(row)
+        data[username] = record
     return data
 
+def bump_data_version():
+    """Invalidate cached user data after a write (create/update)."""
+    st.session_state["_data_version"] = st.session_state.get("_data_version", 0) + 1
+
+def cached_get_user(username):
+    """
+    get_user memoized on st.session_state.
+
+    login() and schedule_editor() both look up the current user on every
+    rerun; caching the record keyed by (username, data version) makes the
+    second and later lookups free until a write bumps the version.
+    """
+    key = (username, st.session_state.get("_data_version", 0))
+    cached = st.session_state.get("_user_cache")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    record = get_user(username)
+    st.session_state["_user_cache"] = (key, record)
+    return record
+
+@st.cache_data
+def load_all_users_cached(version):
+    """
+    Cached wrapper around load_all_users().
+
+    The version argument is a cheap counter bumped by bump_data_version()
+    whenever a schedule is saved, so the cache is invalidated only when the
+    underlying data actually changes.
+    """
+    return load_all_users()
+
+@st.cache_data
+def load_users_cached(version, usernames):
+    """Cached load_users; usernames must be a tuple so it can key the cache."""
+    return load_users(usernames)
+
+@st.cache_data
+def list_users_by_semester(version):
+    """
+    Return {semester: [usernames]} for the comparison page's selection UI.
+
+    Fetches only the two text columns (no schedule masks) and is cached on
+    the data version, so checkbox clicks during user selection cost nothing.
+    """
+    conn = get_conn()
+    cursor = conn.cursor()
+    cursor.execute("SELECT username, semester FROM users ORDER BY semester, username")
+    users_by_semester = {}
+    for username, semester in cursor.fetchall():
+        users_by_semester.setdefault(semester, []).append(username)
+    return users_by_semester
+
 # Predefined semester options up through Summer 2028.
 semester_options = [
     "Summer 2025", "Fall 2025", "Spring 2026",
@@ -102,7 +277,7 @@ def login():
     st.sidebar.title("User Login / Registration")
     username = st.sidebar.text_input("Enter your username:")
     if username:
-        user = get_user(username)
+        user = cached_get_user(username)
         if user:
             st.sidebar.success(f"Logged in as **{username}** (Semester: {user['semester']})")
             st.session_state.current_user = username
@@ -115,132 +290,169 @@ def login():
                 st.session_state.current_user = username
 
 # ---------------------------
-# Schedule Editor with Hour Toggle
+# Schedule Editor
 # ---------------------------
+
+# The grid's column config is the same on every rerun; building the 64
+# CheckboxColumn objects once at import keeps that work off the render path.
+_EDITOR_COLUMN_CONFIG = {ts: st.column_config.CheckboxColumn(ts) for ts in TIME_SLOTS}
+
 def schedule_editor():
     st.header("Edit Your Schedule")
     current_user = st.session_state.current_user
-    user_record = get_user(current_user)
+    user_record = cached_get_user(current_user)
     schedule = user_record.get("schedule", { day: [] for day in get_weekdays() })
-    
-    st.write("For each day, click on the 15‑minute blocks during which you are **BUSY**. "
-             "To mark or clear an entire hour, click the bold hour button at the left.")
-    
-    new_schedule = {}
-    
-    for day in get_weekdays():
-        st.subheader(day)
-        day_busy = []
-        # Loop through each hour from 06:00 to 21:00.
-        for hour in range(6, 22):
-            cols = st.columns(5)
-            toggle_key = f"{current_user}_{day}_toggle_{hour}"
-            # When the toggle button is clicked, toggle the value for all blocks in this hour.
-            if cols[0].button(f"**{hour:02d}:00**", key=toggle_key):
-                # Build keys for the four 15‑minute blocks.
-                block_keys = [f"{current_user}_{day}_{hour:02d}:{m}" for m in ["00", "15", "30", "45"]]
-                all_checked = True
-                for i, key in enumerate(block_keys):
-                    time_str = f"{hour:02d}:{['00','15','30','45'][i]}"
-                    default_val = time_str in schedule.get(day, [])
-                    if key not in st.session_state:
-                        st.session_state[key] = default_val
-                    if not st.session_state[key]:
-                        all_checked = False
-                        break
-                new_value = not all_checked
-                for key in block_keys:
-                    st.session_state[key] = new_value
-
-            # Create checkboxes for the four 15‑minute blocks.
-            for idx, minute in enumerate(["00", "15", "30", "45"]):
-                time_str = f"{hour:02d}:{minute}"
-                default_val = time_str in schedule.get(day, [])
-                key = f"{current_user}_{day}_{time_str}"
-                if key not in st.session_state:
-                    st.session_state[key] = default_val
-                # Do not pass the value= parameter; let the widget use st.session_state.
-                if cols[idx+1].checkbox(time_str, key=key):
-                    day_busy.append(time_str)
-            st.write("")  # spacing between rows
-        new_schedule[day] = day_busy
+
+    st.write("Check the 15‑minute blocks during which you are **BUSY**. "
+             "Each row is a day; drag across cells to mark a whole range at once.")
+
+    # A single data_editor (7 days x 64 checkbox columns) replaces the old
+    # grid of 560 individual button/checkbox widgets, so a rerun reconciles
+    # one widget instead of hundreds.
+    # Hoist each day's busy list into a set so populating the grid does 448
+    # O(1) lookups instead of O(n) list scans per cell.
+    busy_sets = {day: set(schedule.get(day, ())) for day in WEEKDAYS}
+    df = pd.DataFrame(
+        [[ts in busy_sets[day] for ts in TIME_SLOTS] for day in WEEKDAYS],
+        index=WEEKDAYS, columns=TIME_SLOTS)
+    edited = st.data_editor(
+        df,
+        column_config=_EDITOR_COLUMN_CONFIG,
+        key=f"{current_user}_schedule_grid")
 
     if st.button("Save Schedule"):
+        new_schedule = {day: [ts for ts in TIME_SLOTS if edited.at[day, ts]]
+                        for day in WEEKDAYS}
         update_schedule(current_user, new_schedule)
         st.success("Schedule saved successfully!")
 
 # ---------------------------
 # Meeting Gap Finder Functions (15-Minute Resolution)
 # ---------------------------
-def find_common_free_slots(selected_users, duration_slots):
+def find_common_free_runs(selected_users, data):
+    """
+    For each day, find every contiguous block of 15‑minute slots where all
+    selected users are free, regardless of length. Minimum-duration views
+    are cheap filters over this one result, so callers wanting several
+    durations pay for a single pass.
+
+    data is the already-loaded user dict (see load_all_users).
+
+    Returns a dict mapping each day to a list of tuples:
+        (start_time, end_time, length_in_slots)
+    """
+    common_free = { day: [] for day in WEEKDAYS }
+
+    for d, day in enumerate(WEEKDAYS):
+        # One OR per user collapses the whole day; the complement is the
+        # set of slots where everyone is free.
+        combined = 0
+        for user in selected_users:
+            combined |= data[user]["masks"][d]
+        free = ~combined & _FULL_MASK
+
+        # Walk the contiguous runs of set bits in the free mask.
+        while free:
+            start_idx = (free & -free).bit_length() - 1
+            run = free >> start_idx
+            # Number of trailing ones = position of the first zero bit.
+            run_length = ((run + 1) & ~run).bit_length() - 1
+            start_time = TIME_SLOTS[start_idx]
+            end_time = TIME_SLOTS[start_idx + run_length - 1]
+            common_free[day].append((start_time, end_time, run_length))
+            free &= ~(((1 << run_length) - 1) << start_idx)
+    return common_free
+
+def find_common_free_slots(selected_users, duration_slots, data):
     """
     For each day, find contiguous free blocks (of duration_slots consecutive 15‑minute slots)
     where all selected users are free.
-    
-    Returns a dict mapping each day to a list of tuples:
+
+    Kept as a filtered view of find_common_free_runs; returns a dict mapping
+    each day to a list of tuples:
         (start_time, end_time, total_duration_in_minutes)
     """
-    data = load_all_users()
-    time_slots = get_time_slots()
-    weekdays = get_weekdays()
-    common_free = { day: [] for day in weekdays }
-    
-    for day in weekdays:
-        free_flags = []
-        for ts in time_slots:
-            free = True
-            for user in selected_users:
-                user_schedule = data[user]["schedule"]
-                if ts in user_schedule.get(day, []):
-                    free = False
-                    break
-            free_flags.append(free)
-        
-        i = 0
-        while i < len(time_slots):
-            if free_flags[i]:
-                start_idx = i
-                while i < len(time_slots) and free_flags[i]:
-                    i += 1
-                end_idx = i - 1
-                segment_length = end_idx - start_idx + 1
-                if segment_length >= duration_slots:
-                    start_time = time_slots[start_idx]
-                    end_time = time_slots[end_idx]
-                    common_free[day].append((start_time, end_time, segment_length * 15))
-            else:
-                i += 1
-    return common_free
+    runs = find_common_free_runs(selected_users, data)
+    return {day: [(start, end, length * 15) for start, end, length in day_runs
+                  if length >= duration_slots]
+            for day, day_runs in runs.items()}
 
-def find_min_conflict_gap(selected_users, window_slots=4):
+if njit is not None:
+    @njit(cache=True)
+    def _conflict_counts_jit(masks, n_windows, window_mask):
+        """
+        Count, for every (day, window start), how many users have a busy
+        slot inside the window. masks is a (n_users, n_days) uint64 array.
+        """
+        n_users, n_days = masks.shape
+        counts = np.empty((n_days, n_windows), np.int64)
+        for d in range(n_days):
+            for i in range(n_windows):
+                win = np.uint64(window_mask) << np.uint64(i)
+                c = 0
+                for u in range(n_users):
+                    if masks[u, d] & win:
+                        c += 1
+                counts[d, i] = c
+        return counts
+
+def find_min_conflict_gap(selected_users, data, window_slots=4):
     """
     If no completely free gap is available, evaluate every possible one‑hour block (4 slots),
     counting 1 conflict per user if any slot in the block is busy.
-    
+
+    data is the already-loaded user dict (see load_all_users).
+
     Returns a tuple:
       (best_intervals, min_conflict)
     where best_intervals is a list of tuples (day, start_time, end_time, conflict_count)
     and min_conflict is the minimum conflict count found.
     """
-    data = load_all_users()
-    time_slots = get_time_slots()
-    weekdays = get_weekdays()
+    window_mask = (1 << window_slots) - 1
+    n_windows = _N_SLOTS - window_slots + 1
+
+    if njit is not None and selected_users:
+        masks = np.array([data[user]["masks"] for user in selected_users],
+                         dtype=np.uint64)
+        counts = _conflict_counts_jit(masks, n_windows, window_mask)
+        min_conflict = int(counts.min())
+        best_intervals = [(WEEKDAYS[d], TIME_SLOTS[i], TIME_SLOTS[i + window_slots - 1], min_conflict)
+                          for d in range(len(WEEKDAYS)) for i in range(n_windows)
+                          if counts[d, i] == min_conflict]
+        return best_intervals, min_conflict
+
     best_intervals = []
     min_conflict = None
 
-    for day in weekdays:
-        for i in range(len(time_slots) - window_slots + 1):
-            block = time_slots[i : i + window_slots]
+    for d, day in enumerate(WEEKDAYS):
+        # Users with an all-free day can never conflict; drop them once per
+        # day so the per-window loop only visits masks that might be busy.
+        day_masks = [mask for user in selected_users
+                     if (mask := data[user]["masks"][d])]
+        # The OR of all users is the same combined-busy mask the free-run
+        # finder works from: windows it leaves clear are conflict-free
+        # without consulting any individual user.
+        combined = 0
+        for mask in day_masks:
+            combined |= mask
+        for i in range(n_windows):
+            win = window_mask << i
             conflict_count = 0
-            for user in selected_users:
-                user_schedule = data[user]["schedule"]
-                if any(slot in user_schedule.get(day, []) for slot in block):
-                    conflict_count += 1
+            if combined & win:
+                # One AND per user tells whether any slot in the window is
+                # busy. Stop counting once the window is strictly worse than
+                # the best found so far; pruning only above min_conflict
+                # keeps exact ties.
+                for mask in day_masks:
+                    if mask & win:
+                        conflict_count += 1
+                        if min_conflict is not None and conflict_count > min_conflict:
+                            break
             if min_conflict is None or conflict_count < min_conflict:
                 min_conflict = conflict_count
-                best_intervals = [(day, block[0], block[-1], conflict_count)]
+                best_intervals = [(day, TIME_SLOTS[i], TIME_SLOTS[i + window_slots - 1], conflict_count)]
             elif conflict_count == min_conflict:
-                best_intervals.append((day, block[0], block[-1], conflict_count))
+                best_intervals.append((day, TIME_SLOTS[i], TIME_SLOTS[i + window_slots - 1], conflict_count))
     return best_intervals, min_conflict
 
 # ---------------------------
@@ -248,17 +460,11 @@ def find_min_conflict_gap(selected_users, window_slots=4):
 # ---------------------------
 def compare_schedules():
     st.header("Compare Schedules")
-    data = load_all_users()
-    if not data:
+    users_by_semester = list_users_by_semester(st.session_state.get("_data_version", 0))
+    if not users_by_semester:
         st.info("No schedules available. Please have some users create schedules first.")
         return
 
-    # Group users by semester.
-    users_by_semester = {}
-    for user, info in data.items():
-        semester = info["semester"]
-        users_by_semester.setdefault(semester, []).append(user)
-    
     st.subheader("Select users to include in the comparison:")
     selected_users = []
     for semester, users in users_by_semester.items():
@@ -273,18 +479,23 @@ def compare_schedules():
 
     if st.button("Find Common Gaps"):
         st.subheader("Time gaps where all selected users are free:")
-        # Find gaps for 30 minutes (2 slots) and 1 hour (4 slots).
-        common_free_30 = find_common_free_slots(selected_users, duration_slots=2)
-        common_free_60 = find_common_free_slots(selected_users, duration_slots=4)
-        
+        # Load only the selected users' schedules for the comparison.
+        data = load_users_cached(st.session_state.get("_data_version", 0),
+                                 tuple(selected_users))
+        # One pass over the data; the 30-minute (2 slots) and 1-hour
+        # (4 slots) views are length filters over the same free runs.
+        runs = find_common_free_runs(selected_users, data)
+        common_free_30 = {day: [r for r in runs[day] if r[2] >= 2] for day in WEEKDAYS}
+        common_free_60 = {day: [r for r in runs[day] if r[2] >= 4] for day in WEEKDAYS}
+
         found_any = False
         for day in get_weekdays():
             st.markdown(f"**{day}**")
             if common_free_30[day]:
                 st.write("**30‑minute (or longer) free blocks:**")
                 for interval in common_free_30[day]:
-                    start_time, end_time, duration = interval
-                    st.write(f"- {start_time} to {end_time} ({duration} minutes free)")
+                    start_time, end_time, length = interval
+                    st.write(f"- {start_time} to {end_time} ({length * 15} minutes free)")
                 if common_free_60[day]:
                     st.write("**Also, these blocks allow for a 1‑hour meeting:**")
                     for interval in common_free_60[day]:
@@ -298,7 +509,7 @@ def compare_schedules():
         if not found_any:
             st.info("No time gap found where all selected users are completely free.")
             st.subheader("Best one‑hour block (with minimal conflicts):")
-            best_intervals, min_conflict = find_min_conflict_gap(selected_users, window_slots=4)
+            best_intervals, min_conflict = find_min_conflict_gap(selected_users, data, window_slots=4)
             st.write(f"Minimum conflict count: {min_conflict} user(s) busy.")
             for interval in best_intervals:
                 day, start_time, end_time, conflict_count = interval